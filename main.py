@@ -1,133 +1,490 @@
 # main.py
+import os
+import re
+import csv
 import json
 import argparse
+import itertools
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+import numpy as np
 import pandas as pd
-from ssvc_converter import SsvcConverter
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # The PyArrow CSV reader and Parquet output are optional
+    pa = pa_csv = pq = None
+try:
+    import polars as pl
+except ImportError:  # The Polars engine is optional
+    pl = None
+from ssvc_converter import SsvcConverter, ExploitationLevel, Automatable, TechnicalImpact
+
+# --- Processing Settings ---
+DEFAULT_CHUNKSIZE = 100_000
+CSV_WRITER_CHUNKSIZE = 50_000  # Rows formatted per write, bounding the CSV writer's buffer
+# Cells read as missing values: the default list of pandas' read_csv, which every other reader is given
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+             '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# --- Input Mappings ---
+EXPLOIT_MAPPING = {"internet": "active", "existant": "active", "proof of concept": "poc", "non prouvé": "none"}
+CONTEXT_MAPPING = {"X": "medium", "XX": "high", "XXX": "high", "XXXX": "high"} # //////////// SHOULD BE UPDATED with the YOUR CONTEXT
+
+# --- CVSS Vector Parsing ---
+CVSS_BASE_METRICS = ['av', 'ac', 'pr', 'ui', 's', 'c', 'i', 'a']
+# A vector is only read when every "/"-separated part is a single "KEY:value" pair, as before:
+# vectors such as "CVSS:3.1/AV:N/.../A:H/" are still reported as missing CVSS data
+CVSS_VECTOR_SHAPE = r'[^/:]*:[^/:]*(?:/[^/:]*:[^/:]*)*'
+# One lookahead per base metric, so the metrics are captured by name whatever their order in the vector
+CVSS_VECTOR_PATTERN = re.compile(
+    rf'^(?={CVSS_VECTOR_SHAPE}\Z)'
+    r'(?:(?=(?:.*/)?cvss:(?P<cvss>[^/]*)))?'
+    + ''.join(rf'(?=(?:.*/)?{metric}:(?P<{metric}>[^/]*))' for metric in CVSS_BASE_METRICS),
+    re.IGNORECASE
+)
+# Every "KEY:value" pair, for well-formed vectors the pattern above cannot read (e.g. missing base metrics)
+CVSS_SHAPE_PATTERN = re.compile(CVSS_VECTOR_SHAPE)
+CVSS_METRIC_PATTERN = re.compile(r'([^/:]*):([^/:]*)')
+
+# --- Vectorized SSVC Inputs ---
+CVSS_DECISION_METRICS = ['ac', 'pr', 'ui', 'c', 'i', 'a']
+VALID_IMPACT_VALUES = ['h', 'l', 'n']
+# Integer codes follow the declaration order of the matching Enum
+EXPLOITATION_CODES = {'active': 0, 'poc': 1, 'none': 2}
+MISSION_CODES = {'high': 0, 'medium': 1, 'low': 2}
+# Report values of each decision point, indexed by the same integer codes
+EXPLOITATION_VALUES = np.array([level.value for level in ExploitationLevel], dtype=object)
+AUTOMATABLE_VALUES = np.array([value.value for value in Automatable], dtype=object)
+TECHNICAL_IMPACT_VALUES = np.array([value.value for value in TechnicalImpact], dtype=object)
+# Inputs of decide_row, in its argument order
+FALLBACK_COLUMNS = CVSS_DECISION_METRICS + ['exploit_maturity', 'system_context', 'Nature Exploit', 'Criticité']
+
+# --- Report Columns and Translations ---
+RENAME_MAPPING = {
+    'av': "Vecteur d'Attaque (AV)", 'ac': "Complexité d'Attaque (AC)", 'pr': "Privilèges Requis (PR)",
+    'ui': "Interaction Utilisateur (UI)", 's': "Portée (S)", 'c': "Impact Confidentialité (C)",
+    'i': "Impact Intégrité (I)", 'a': "Impact Disponibilité (A)",
+    'exploit_maturity': "Maturité Exploit (Standard)", 'system_context': "Contexte Système (Standard)",
+    'SSVC Exploitation': "SSVC - Niveau d'Exploitation", 'SSVC Automatable': "SSVC - Est Automatisable",
+    'SSVC Technical Impact': "SSVC - Impact Technique", 'SSVC Action': "SSVC - Action Finale"
+}
+
+IMPACT_MAP = {'n': 'Aucun', 'l': 'Faible', 'h': 'Élevé'}
+# Keyed by the short metric names: values are translated before the single rename of the report columns
+VALUE_TRANSLATION_MAP = {
+    'av': {'n': 'Réseau', 'a': 'Adjacent', 'l': 'Local', 'p': 'Physique'},
+    'ac': {'l': 'Faible', 'h': 'Élevée'},
+    'pr': {'n': 'Aucun', 'l': 'Faibles', 'h': 'Élevés'},
+    'ui': {'n': 'Aucune', 'r': 'Requise'},
+    's': {'u': 'Inchangée', 'c': 'Changée'},
+    'c': IMPACT_MAP, 'i': IMPACT_MAP, 'a': IMPACT_MAP,
+}
+
+# Low-cardinality report columns, stored dictionary-encoded in Parquet reports
+CATEGORICAL_REPORT_COLUMNS = [RENAME_MAPPING[col] for col in VALUE_TRANSLATION_MAP] + [
+    "Maturité Exploit (Standard)", "Contexte Système (Standard)", "SSVC - Niveau d'Exploitation",
+    "SSVC - Est Automatisable", "SSVC - Impact Technique", "SSVC - Action Finale"
+]
 
 # --- Data Loading Functions ---
-def load_vulnerabilities_from_csv(filename: str) -> pd.DataFrame:
-    """Loads vulnerabilities from a CSV file and returns a pandas DataFrame."""
+def read_csv_chunks_with_pyarrow(filename: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Streams a CSV file with PyArrow's multithreaded reader, yielding DataFrames of at most `chunksize` rows."""
+    # Every column is declared as text up front, as with dtype=str: otherwise PyArrow infers the types
+    # from the first block only and may fail on a later one
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), [])
+    convert_options = pa_csv.ConvertOptions(column_types={col: pa.string() for col in header},
+                                            null_values=NA_VALUES, strings_can_be_null=True)
+
+    # Quoted cells may span several lines (e.g. descriptions), as the pandas C parser accepts
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+
+    with pa_csv.open_csv(filename, parse_options=parse_options, convert_options=convert_options) as reader:
+        # The reader yields blocks of a fixed byte size: they are regrouped into chunks of `chunksize` rows
+        batches, rows = [], 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            while rows >= chunksize:
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                yield table.slice(0, chunksize).to_pandas()
+                remainder = table.slice(chunksize)
+                batches, rows = remainder.to_batches(), remainder.num_rows
+        if rows:
+            yield pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+
+def load_vulnerabilities_from_csv(filename: str, chunksize: int = DEFAULT_CHUNKSIZE, csv_engine: str = 'c') -> Iterator[pd.DataFrame]:
+    """Lazily loads vulnerabilities from a CSV file, yielding pandas DataFrames of at most `chunksize` rows."""
+    chunks_read = 0
     try:
-        df = pd.read_csv(filename, delimiter=',')
-        df.columns = df.columns.str.strip()
-        return df
+        if csv_engine == 'pyarrow':
+            reader = read_csv_chunks_with_pyarrow(filename, chunksize)
+        else:
+            reader = pd.read_csv(filename, delimiter=',', dtype=str, chunksize=chunksize)
+        with closing(reader):
+            for df in reader:
+                df.columns = df.columns.str.strip()
+                chunks_read += 1
+                yield df
     except FileNotFoundError:
         print(f"Error: The file '{filename}' was not found.")
-        return pd.DataFrame()
     except Exception as e:
+        # Past the first chunk, stopping quietly would leave a truncated report that looks complete
+        if chunks_read:
+            raise
         print(f"Error while reading the CSV file: {e}")
-        return pd.DataFrame()
+
+def load_vulnerabilities_with_polars(filename: str) -> "pl.DataFrame":
+    """Loads vulnerabilities from a CSV file into a Polars DataFrame, reading every column as text."""
+    try:
+        df = pl.read_csv(filename, separator=',', infer_schema=False, null_values=NA_VALUES)
+        return df.rename({col: col.strip() for col in df.columns})
+    except FileNotFoundError:
+        print(f"Error: The file '{filename}' was not found.")
+        return pl.DataFrame()
+    except Exception as e:
+        print(f"Error while reading the CSV file: {e}")
+        return pl.DataFrame()
+
+# --- CVSS Parsing Functions ---
+def parse_cvss_vector(vector_string: str) -> dict:
+    """Parses a single CVSS vector into a dict of lowercase metric names and values, or an empty dict if malformed."""
+    vector_string = str(vector_string)
+    if not CVSS_SHAPE_PATTERN.fullmatch(vector_string):
+        return {}
+    return {key.lower(): value.lower() for key, value in CVSS_METRIC_PATTERN.findall(vector_string)}
+
+def extract_cvss_metrics(vectors: pd.Series) -> pd.DataFrame:
+    """Extracts the CVSS metrics of a Series of vectors into lowercase categorical columns with a single regex pass."""
+    # Lowercasing the vectors once is much cheaper than lowercasing every extracted metric afterwards
+    vectors = vectors.str.lower()
+    cvss_metrics_df = vectors.str.extract(CVSS_VECTOR_PATTERN)
+
+    # Fallback: vectors the regex cannot read (e.g. missing base metrics) are split row by row
+    unmatched = cvss_metrics_df['av'].isna() & vectors.notna()
+    if unmatched.any():
+        # Built in one pass from the list of dicts, rather than expanding each dict with apply(pd.Series)
+        parsed = pd.DataFrame.from_records(vectors[unmatched].map(parse_cvss_vector).tolist(),
+                                           index=vectors.index[unmatched], columns=cvss_metrics_df.columns)
+        cvss_metrics_df.loc[unmatched] = parsed.astype(object)
+
+    # Each metric only takes a handful of values: categorical columns keep them as compact integer codes
+    return cvss_metrics_df.astype('category')
+
+# --- SSVC Calculation Functions ---
+def validate_cvss_columns(dataframe: pd.DataFrame) -> pd.Series:
+    """Flags, for a whole chunk at once, the rows whose CVSS metrics can be fed to the SSVC decision as is."""
+    cvss = dataframe[CVSS_DECISION_METRICS]
+    return cvss.notna().all(axis=1) & cvss[['c', 'i', 'a']].isin(VALID_IMPACT_VALUES).all(axis=1)
+
+def decide_row(converter: SsvcConverter, ac, pr, ui, c, i, a, exploit_maturity, system_context,
+               nature_exploit, criticite) -> dict:
+    """Computes the SSVC results of a single row, turning any invalid input into an error entry."""
+    try:
+        # Fail Fast: Check for missing CVSS data
+        if ac is None or pd.isna(ac):
+            raise ValueError("Données CVSS manquantes ou mal formatées")
+
+        # Fail Fast: Check for unrecognized 'Nature Exploit'
+        if pd.isna(exploit_maturity):
+            raise ValueError(f"Nature Exploit non reconnue: '{nature_exploit}'")
+
+        # Fail Fast: Check for unrecognized 'Criticité'
+        if pd.isna(system_context):
+            raise ValueError(f"Criticité non reconnue: '{criticite}'")
+
+        # Fail Fast: The converter does not type-check its inputs, so incomplete vectors are caught here
+        metrics = [('attack_complexity', ac), ('privileges_required', pr), ('user_interaction', ui),
+                   ('confidentiality', c), ('integrity', i), ('availability', a)]
+        for arg_name, arg_val in metrics:
+            if not isinstance(arg_val, str):
+                raise TypeError(f"{arg_name} must be a string.")
+
+        decision = converter.get_ssvc_decision_path(
+            ac=ac, pr=pr, ui=ui, c=c, i=i, a=a,
+            exploit_maturity=exploit_maturity, system_context=system_context
+        )
+
+        return {
+            'SSVC Exploitation': decision['path']['Exploitation'],
+            'SSVC Automatable': decision['path']['Automatable'],
+            'SSVC Technical Impact': decision['path']['Technical Impact'],
+            'SSVC Action': decision['action']
+        }
+
+    # Catch any error raised for this specific row
+    except (ValueError, TypeError, KeyError) as e:
+        return {
+            'SSVC Exploitation': 'Erreur', 'SSVC Automatable': 'Erreur',
+            'SSVC Technical Impact': 'Erreur', 'SSVC Action': f'Erreur de traitement: {e}'
+        }
+
+def decide_ssvc(converter: SsvcConverter, exploitation_codes: np.ndarray, auto_codes: np.ndarray, tech_codes: np.ndarray,
+                mission_codes: np.ndarray, is_valid: np.ndarray, fallback_rows: Iterable[tuple]) -> dict:
+    """Builds the SSVC result columns of a batch from the integer codes of its decision points.
+
+    Rows flagged False in `is_valid` are decided by decide_row instead, so that they report the exact error:
+    `fallback_rows` yields their FALLBACK_COLUMNS values, in order.
+    """
+    results = {
+        'SSVC Exploitation': EXPLOITATION_VALUES[exploitation_codes],
+        'SSVC Automatable': AUTOMATABLE_VALUES[auto_codes],
+        'SSVC Technical Impact': TECHNICAL_IMPACT_VALUES[tech_codes],
+        'SSVC Action': converter.get_final_actions(exploitation_codes, auto_codes, tech_codes, mission_codes)
+    }
+    for position, row in zip(np.flatnonzero(~is_valid), fallback_rows):
+        for col, value in decide_row(converter, *row).items():
+            results[col][position] = value
+    return results
+
+# --- Processing Functions ---
+def translate_values(values: pd.Series, mapping: dict) -> pd.Series:
+    """Translates the values of a column into a categorical column, leaving unmapped values untouched."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Only the categories are renamed: the cost depends on the number of distinct values, not of rows
+        return values.cat.rename_categories(mapping)
+    return values.map(mapping).fillna(values).astype('category')
+
+def process_chunk(dataframe: pd.DataFrame, converter: SsvcConverter) -> pd.DataFrame:
+    """Runs the whole SSVC pipeline on a chunk of vulnerabilities and returns the translated report rows."""
+    # --- 1. Data Preparation (Input Metrics) ---
+    # --- THE FIX IS HERE (Part 1) ---
+    # We remove .fillna('none') to stop assigning a default value.
+    dataframe[['Nature Exploit', 'Criticité']] = dataframe[['Nature Exploit', 'Criticité']].astype('category')
+    dataframe['exploit_maturity'] = dataframe['Nature Exploit'].str.lower().map(EXPLOIT_MAPPING).astype('category')
+    dataframe['system_context'] = dataframe['Criticité'].str.lower().map(CONTEXT_MAPPING).astype('category')
+
+    # Columns are added in place rather than concatenated, which would copy the whole chunk
+    cvss_metrics_df = extract_cvss_metrics(dataframe['CVSS 3 Vecteur'])
+    for col in cvss_metrics_df.columns:
+        dataframe[col] = cvss_metrics_df[col]
+
+    # --- 2. Vectorized SSVC Calculation ---
+    # Every decision point is computed column-wise; the final action is looked up from the
+    # converter's precomputed decision table instead of walking the tree row by row.
+    cvss = dataframe[CVSS_DECISION_METRICS]
+    automatable = cvss['ac'].eq('l') & cvss['pr'].eq('n') & cvss['ui'].eq('n')
+    tech_total = cvss['c'].eq('h') & cvss['i'].eq('h') & cvss['a'].eq('h')
+    exploitation_codes = dataframe['exploit_maturity'].map(EXPLOITATION_CODES).astype(float)
+    mission_codes = dataframe['system_context'].map(MISSION_CODES).astype(float)
+
+    # Rows with missing or invalid inputs are left to the per-row fallback
+    is_valid = (validate_cvss_columns(dataframe) & exploitation_codes.notna() & mission_codes.notna()).to_numpy()
+    invalid_rows = dataframe.loc[~is_valid, FALLBACK_COLUMNS]
+    # Zipping plain column arrays avoids building a Series per row, as iterrows() would
+    fallback_rows = zip(*(invalid_rows[col].to_numpy() for col in FALLBACK_COLUMNS))
+
+    results = decide_ssvc(
+        converter, exploitation_codes.fillna(0).astype(int).to_numpy(), (~automatable).astype(int).to_numpy(),
+        (~tech_total).astype(int).to_numpy(), mission_codes.fillna(0).astype(int).to_numpy(), is_valid, fallback_rows
+    )
+
+    # --- 3. Adding All Result Columns ---
+    for col, values in results.items():
+        dataframe[col] = pd.Categorical(values)
+
+    # --- 4. Translating Metric Values ---
+    for col, mapping in VALUE_TRANSLATION_MAP.items():
+        dataframe[col] = translate_values(dataframe[col], mapping)
+
+    # --- 5. Renaming Columns for Readability ---
+    return dataframe.rename(columns=RENAME_MAPPING)
+
+def process_chunks_in_parallel(chunks: Iterable[pd.DataFrame], converter: SsvcConverter, jobs: int) -> Iterator[pd.DataFrame]:
+    """Processes chunks across `jobs` worker processes, yielding the report chunks in input order."""
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(process_chunk, chunk, converter))
+            # Only read ahead a couple of chunks per worker, so memory stays bounded while the writer catches up
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def process_frame_polars(dataframe: "pl.DataFrame", converter: SsvcConverter) -> "pl.DataFrame":
+    """Runs the whole SSVC pipeline with Polars expressions and returns the same report as process_chunk."""
+    vectors = pl.col('CVSS 3 Vecteur')
+    well_formed = vectors.str.contains(rf'^{CVSS_VECTOR_SHAPE}$')
+    # Rust regexes have no lookaheads: each metric is extracted on its own, which also covers the
+    # incomplete vectors that the pandas engine hands over to parse_cvss_vector
+    extracted = [
+        pl.when(well_formed).then(vectors.str.extract(rf'(?is)^(?:.*/)?{metric}:([^/]*)', 1).str.to_lowercase()).alias(metric)
+        for metric in ['cvss'] + CVSS_BASE_METRICS
+    ]
+    dataframe = dataframe.with_columns(
+        pl.col('Nature Exploit').str.to_lowercase().replace_strict(EXPLOIT_MAPPING, default=None).alias('exploit_maturity'),
+        pl.col('Criticité').str.to_lowercase().replace_strict(CONTEXT_MAPPING, default=None).alias('system_context'),
+        *extracted
+    )
+
+    # SSVC decision codes, with the rows left to the per-row fallback flagged in is_valid
+    codes = dataframe.select(
+        exploitation=pl.col('exploit_maturity').replace_strict(EXPLOITATION_CODES, default=None, return_dtype=pl.Int64),
+        automatable=(~((pl.col('ac') == 'l') & (pl.col('pr') == 'n') & (pl.col('ui') == 'n'))).cast(pl.Int64),
+        tech_impact=(~((pl.col('c') == 'h') & (pl.col('i') == 'h') & (pl.col('a') == 'h'))).cast(pl.Int64),
+        mission=pl.col('system_context').replace_strict(MISSION_CODES, default=None, return_dtype=pl.Int64),
+    )
+    is_valid = (
+        dataframe.select(pl.all_horizontal(pl.col(CVSS_DECISION_METRICS).is_not_null())
+                         & pl.all_horizontal(pl.col(['c', 'i', 'a']).is_in(VALID_IMPACT_VALUES))).to_series()
+        & codes['exploitation'].is_not_null() & codes['mission'].is_not_null()
+    ).fill_null(False).to_numpy()
+    invalid_rows = dataframe.filter(~pl.Series(is_valid)).select(FALLBACK_COLUMNS)
+    # Missing text is reported as 'nan', exactly as with the pandas engine
+    fallback_rows = ((*metrics, np.nan if nature_exploit is None else nature_exploit, np.nan if criticite is None else criticite)
+                     for *metrics, nature_exploit, criticite in invalid_rows.iter_rows())
+
+    results = decide_ssvc(converter, *(codes[col].fill_null(0).to_numpy() for col in codes.columns), is_valid, fallback_rows)
+
+    # Result columns are added and metric values translated in a single pass, before the final rename
+    final_df = dataframe.with_columns(
+        *(pl.Series(col, values, dtype=pl.String) for col, values in results.items()),
+        *(pl.col(col).replace(mapping) for col, mapping in VALUE_TRANSLATION_MAP.items()),
+    )
+    return final_df.rename(RENAME_MAPPING)
+
+# --- Output Functions ---
+def write_csv_report(chunks: Iterable[pd.DataFrame], output_file: str, excel_compat: bool = False) -> int:
+    """Streams report chunks to a single CSV file, writing the header once. Returns the number of rows written."""
+    rows_written = 0
+    # The BOM is only needed for Excel on Windows to detect UTF-8
+    with open(output_file, 'w', encoding='utf-8-sig' if excel_compat else 'utf-8', newline='') as report:
+        for final_df in chunks:
+            final_df.to_csv(report, index=False, sep=';', header=rows_written == 0, lineterminator='\n',
+                            quoting=csv.QUOTE_MINIMAL, chunksize=CSV_WRITER_CHUNKSIZE)
+            rows_written += len(final_df)
+    return rows_written
+
+def write_parquet_report(chunks: Iterable[pd.DataFrame], output_file: str) -> int:
+    """Streams report chunks to a single zstd-compressed Parquet file. Returns the number of rows written."""
+    rows_written = 0
+    writer = None
+    try:
+        for final_df in chunks:
+            categorical_columns = [col for col in CATEGORICAL_REPORT_COLUMNS if col in final_df]
+            final_df[categorical_columns] = final_df[categorical_columns].astype('category')
+            if writer is None:
+                # Every report column is text: fixing the schema up front keeps all row groups consistent,
+                # even when a column is entirely empty in the first chunk
+                schema = pa.schema([
+                    (col, pa.dictionary(pa.int32(), pa.string()) if col in categorical_columns else pa.string())
+                    for col in final_df.columns
+                ])
+                table = pa.Table.from_pandas(final_df, schema=schema, preserve_index=False)
+                writer = pq.ParquetWriter(output_file, table.schema, compression='zstd')
+            else:
+                table = pa.Table.from_pandas(final_df, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows_written += len(final_df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_written
+
+def write_polars_report(final_df: "pl.DataFrame", output_file: str, output_format: str, excel_compat: bool = False) -> int:
+    """Writes a Polars report to a CSV or zstd-compressed Parquet file. Returns the number of rows written."""
+    if output_format == 'parquet':
+        final_df.with_columns(pl.col(CATEGORICAL_REPORT_COLUMNS).cast(pl.Categorical)).write_parquet(
+            output_file, compression='zstd')
+    else:
+        final_df.write_csv(output_file, separator=';', include_bom=excel_compat)
+    return final_df.height
 
 # --- Main Function ---
+def positive_int(value: str) -> int:
+    """Argparse type accepting integers greater than or equal to 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description="Vulnerability prioritization tool using SSVC.")
     parser.add_argument("input_file", help="The input file (.csv) containing the vulnerabilities.")
+    parser.add_argument("--chunksize", type=positive_int, default=DEFAULT_CHUNKSIZE,
+                        help=f"Number of rows read and processed at a time (default: {DEFAULT_CHUNKSIZE}).")
+    parser.add_argument("--format", choices=['csv', 'parquet'], default='csv', dest='output_format',
+                        help="Format of the final report (default: csv). Parquet requires the 'pyarrow' package.")
+    parser.add_argument("--engine", choices=['pandas', 'polars'], default='pandas',
+                        help="DataFrame library running the pipeline (default: pandas). "
+                             "The multithreaded Polars engine requires the 'polars' package and loads the whole file.")
+    parser.add_argument("--csv-engine", choices=['c', 'pyarrow'], default='c' if pa_csv is None else 'pyarrow',
+                        help="Parser reading the CSV file with the pandas engine (default: pyarrow when installed, else c).")
+    parser.add_argument("--jobs", type=positive_int, default=1,
+                        help="Number of processes running the pandas pipeline on chunks in parallel (default: 1).")
+    parser.add_argument("--excel-compat", action='store_true',
+                        help="Start the CSV report with a UTF-8 BOM so that Excel for Windows detects the encoding.")
     args = parser.parse_args()
     input_file = args.input_file
 
+    if args.engine == 'polars' and pl is None:
+        print("Error: The Polars engine requires the 'polars' package.")
+        return
+
+    if args.csv_engine == 'pyarrow' and pa_csv is None:
+        print("Error: The PyArrow CSV reader requires the 'pyarrow' package.")
+        return
+
+    if args.output_format == 'parquet' and args.engine == 'pandas' and pq is None:
+        print("Error: Parquet output requires the 'pyarrow' package.")
+        return
+
     if not input_file.lower().endswith('.csv'):
         print("Error: This version of the script is optimized for .csv files.")
         return
 
+    # The extension is replaced whatever its case, so that e.g. 'BIG.CSV' never yields its own path
+    output_file = os.path.splitext(input_file)[0] + f'_ssvc_rapport_final.{args.output_format}'
+    if os.path.abspath(output_file) == os.path.abspath(input_file) or (
+            os.path.exists(output_file) and os.path.exists(input_file) and os.path.samefile(output_file, input_file)):
+        print(f"Error: The report would overwrite the input file: {output_file}")
+        return
+
     print(f"--- Reading CSV file: {input_file} ---")
-    dataframe = load_vulnerabilities_from_csv(input_file)
+    if args.engine == 'polars':
+        dataframe = load_vulnerabilities_with_polars(input_file)
+        has_data = not dataframe.is_empty()
+    else:
+        chunks = load_vulnerabilities_from_csv(input_file, args.chunksize, args.csv_engine)
+        first_chunk = next(chunks, None)
+        has_data = first_chunk is not None and not first_chunk.empty
 
-    if dataframe.empty:
+    if not has_data:
         print("No data to process. Exiting program.")
         return
 
     print("--- Processing vulnerabilities ---")
     converter = SsvcConverter()
-
-    # --- 1. Data Preparation (Input Metrics) ---
-    exploit_mapping = {"internet": "active", "existant": "active", "proof of concept": "poc", "non prouvé": "none"}
-    context_mapping = {"X": "medium", "XX": "high", "XXX": "high", "XXXX": "high"} # //////////// SHOULD BE UPDATED with the YOUR CONTEXT
-
-    # --- THE FIX IS HERE (Part 1) ---
-    # We remove .fillna('none') to stop assigning a default value.
-    dataframe['exploit_maturity'] = dataframe['Nature Exploit'].str.lower().map(exploit_mapping)
-    dataframe['system_context'] = dataframe['Criticité'].str.lower().map(context_mapping)
-
-    def parse_cvss_vector(vector_string: str) -> dict:
-        try:
-            return {key.lower(): value.lower() for item in str(vector_string).split('/') for key, value in [item.split(':')]}
-        except (ValueError, AttributeError):
-            return {}
-
-    cvss_metrics_df = dataframe['CVSS 3 Vecteur'].apply(parse_cvss_vector).apply(pd.Series)
-    dataframe = pd.concat([dataframe, cvss_metrics_df], axis=1)
-
-    # --- 2. SSVC Calculation with Error Handling per Row ---
-    results_list = []
-    for index, row in dataframe.iterrows():
-        try:
-            # Fail Fast: Check for missing CVSS data
-            if row.get('ac') is None or pd.isna(row.get('ac')):
-                raise ValueError("Données CVSS manquantes ou mal formatées")
-
-            # --- THE FIX IS HERE (Part 2) ---
-            # Fail Fast: Check for unrecognized 'Nature Exploit'
-            if pd.isna(row.get('exploit_maturity')):
-                raise ValueError(f"Nature Exploit non reconnue: '{row['Nature Exploit']}'")
-
-            # Fail Fast: Check for unrecognized 'Criticité'
-            if pd.isna(row.get('system_context')):
-                raise ValueError(f"Criticité non reconnue: '{row['Criticité']}'")
-
-            decision = converter.get_ssvc_decision_path(
-                ac=row["ac"], pr=row["pr"], ui=row["ui"], c=row["c"], i=row["i"], a=row["a"],
-                exploit_maturity=row["exploit_maturity"], system_context=row["system_context"]
-            )
-
-            flat_results = {
-                'SSVC Exploitation': decision['path']['Exploitation'],
-                'SSVC Automatable': decision['path']['Automatable'],
-                'SSVC Technical Impact': decision['path']['Technical Impact'],
-                'SSVC Action': decision['action']
-            }
-            results_list.append(flat_results)
-
-        # Catch any error raised for this specific row
-        except (ValueError, TypeError, KeyError) as e:
-            results_list.append({
-                'SSVC Exploitation': 'Erreur', 'SSVC Automatable': 'Erreur',
-                'SSVC Technical Impact': 'Erreur', 'SSVC Action': f'Erreur de traitement: {e}'
-            })
-
-    # --- 3. Adding All Result Columns ---
-    results_df = pd.DataFrame(results_list, index=dataframe.index)
-    final_df = pd.concat([dataframe, results_df], axis=1)
-
-    # --- 4. Renaming Columns for Readability ---
-    rename_mapping = {
-        'av': "Vecteur d'Attaque (AV)", 'ac': "Complexité d'Attaque (AC)", 'pr': "Privilèges Requis (PR)",
-        'ui': "Interaction Utilisateur (UI)", 's': "Portée (S)", 'c': "Impact Confidentialité (C)",
-        'i': "Impact Intégrité (I)", 'a': "Impact Disponibilité (A)",
-        'exploit_maturity': "Maturité Exploit (Standard)", 'system_context': "Contexte Système (Standard)",
-        'SSVC Exploitation': "SSVC - Niveau d'Exploitation", 'SSVC Automatable': "SSVC - Est Automatisable",
-        'SSVC Technical Impact': "SSVC - Impact Technique", 'SSVC Action': "SSVC - Action Finale"
-    }
-    final_df = final_df.rename(columns=rename_mapping)
-
-    # --- 5. Translating Metric Values ---
-    impact_map = {'n': 'Aucun', 'l': 'Faible', 'h': 'Élevé'}
-    value_translation_map = {
-        "Vecteur d'Attaque (AV)": {'n': 'Réseau', 'a': 'Adjacent', 'l': 'Local', 'p': 'Physique'},
-        "Complexité d'Attaque (AC)": {'l': 'Faible', 'h': 'Élevée'},
-        "Privilèges Requis (PR)": {'n': 'Aucun', 'l': 'Faibles', 'h': 'Élevés'},
-        "Interaction Utilisateur (UI)": {'n': 'Aucune', 'r': 'Requise'},
-        "Portée (S)": {'u': 'Inchangée', 'c': 'Changée'},
-        "Impact Confidentialité (C)": impact_map, "Impact Intégrité (I)": impact_map, "Impact Disponibilité (A)": impact_map,
-    }
-    final_df = final_df.replace(value_translation_map)
-
-    # --- 6. Saving the Output ---
-    output_file = input_file.replace('.csv', '_ssvc_rapport_final.csv')
+    # Identifies a report left by a previous run, which must survive an error raised before it is rewritten
+    previous_report = os.stat(output_file).st_mtime_ns if os.path.exists(output_file) else None
     try:
-        final_df.to_csv(output_file, index=False, sep=';', encoding='utf-8-sig')
-        print(f"\n✅ Success! The final report has been saved to: {output_file}")
+        if args.engine == 'polars':
+            rows_written = write_polars_report(process_frame_polars(dataframe, converter), output_file,
+                                               args.output_format, args.excel_compat)
+        else:
+            # --- Saving the Output, one chunk at a time ---
+            chunks = itertools.chain([first_chunk], chunks)
+            if args.jobs > 1:
+                final_chunks = process_chunks_in_parallel(chunks, converter, args.jobs)
+            else:
+                final_chunks = (process_chunk(chunk, converter) for chunk in chunks)
+            if args.output_format == 'parquet':
+                rows_written = write_parquet_report(final_chunks, output_file)
+            else:
+                rows_written = write_csv_report(final_chunks, output_file, args.excel_compat)
+        print(f"\n✅ Success! The final report ({rows_written} vulnerabilities) has been saved to: {output_file}")
     except Exception as e:
         print(f"\n❌ Error while saving the file: {e}")
+        # Chunks written before the error would otherwise pass for a complete report. Only a file
+        # written by this run is removed
+        if os.path.exists(output_file) and os.stat(output_file).st_mtime_ns != previous_report:
+            os.remove(output_file)
+            print(f"The incomplete report has been removed: {output_file}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,7 @@
 # ssvc_converter.py
 from enum import Enum
+from functools import lru_cache
+import numpy as np
 
 # --- Enums (Unchanged) ---
 class ExploitationLevel(Enum):
@@ -22,74 +24,123 @@ class SsvcAction(Enum):
     TRACK_STAR = "Track*"
     TRACK = "Track"
 
+# --- Integer Codes (Enum declaration order), used by the integer decision tree ---
+SSVC_ACTIONS = list(SsvcAction)
+ACTIVE, POC = 0, 1
+AUTOMATABLE_YES = 0
+TECHNICAL_IMPACT_PARTIAL = 1
+MISSION_HIGH, MISSION_LOW = 0, 2
+ACT, ATTEND, TRACK_STAR, TRACK = 0, 1, 2, 3
+# Name and number of codes of each decision point, in the argument order of _decide
+DECISION_POINTS = (('exploitation', len(ExploitationLevel)), ('automatable', len(Automatable)),
+                   ('tech_impact', len(TechnicalImpact)), ('mission_impact', len(MissionImpact)))
+
+def _decide(exploitation, automatable, tech_impact, mission_impact):
+    if exploitation == ACTIVE:
+        if automatable == AUTOMATABLE_YES: return ACT
+        else:
+            if tech_impact == TECHNICAL_IMPACT_PARTIAL: return ATTEND
+            else: return ACT if mission_impact != MISSION_LOW else ATTEND
+    elif exploitation == POC:
+        if automatable == AUTOMATABLE_YES:
+            if tech_impact == TECHNICAL_IMPACT_PARTIAL: return TRACK_STAR
+            else: return ATTEND if mission_impact != MISSION_LOW else TRACK_STAR
+        else:
+            if tech_impact == TECHNICAL_IMPACT_PARTIAL: return TRACK_STAR
+            else: return ATTEND if mission_impact == MISSION_HIGH else TRACK_STAR
+    else:
+        if automatable == AUTOMATABLE_YES:
+            if tech_impact == TECHNICAL_IMPACT_PARTIAL: return TRACK
+            else: return ATTEND if mission_impact == MISSION_HIGH else TRACK
+        else:
+            if tech_impact == TECHNICAL_IMPACT_PARTIAL: return TRACK
+            else: return TRACK_STAR if mission_impact == MISSION_HIGH else TRACK
+
+@lru_cache(maxsize=None)
+def _compiled_decide_array():
+    # Numba is optional and only imported on first use: importing it costs more than a whole small run
+    try:
+        from ssvc_kernels import decide_array
+    except ImportError:
+        return None
+    return decide_array
+
 class SsvcConverter:
     """
     A class to convert CVSS metrics, exploit maturity, and system context
     into a Stakeholder-Specific Vulnerability Categorization (SSVC) decision path and final action.
     """
 
-    def get_exploitation_level(self, exploit_maturity: str) -> ExploitationLevel:
-        # Fail Fast: Ensure input is a string
-        if not isinstance(exploit_maturity, str):
-            raise TypeError("exploit_maturity must be a string.")
+    # Exploit maturity states, built once for the whole class
+    _ACTIVE_STATES = frozenset({"active", "attacked", "high", "critical", "functional"})
+    _POC_STATES = frozenset({"poc", "proof-of-concept", "available"})
 
-        exploit_maturity = exploit_maturity.lower()
-        active_states = {"active", "attacked", "high", "critical", "functional"}
-        poc_states = {"poc", "proof-of-concept", "available"}
+    def __init__(self):
+        # Precompute the whole decision tree once, both as a dict keyed by Enums for single decisions
+        # and as an array indexed by the declaration order of each Enum for vectorized ones
+        self._table = {}
+        self._action_names = np.array([action.value for action in SsvcAction], dtype=object)
+        self._action_table = np.empty((len(ExploitationLevel), len(Automatable), len(TechnicalImpact), len(MissionImpact)), dtype=np.uint8)
+        for e, exploitation in enumerate(ExploitationLevel):
+            for au, automatable in enumerate(Automatable):
+                for t, tech_impact in enumerate(TechnicalImpact):
+                    for m, mission_impact in enumerate(MissionImpact):
+                        code = _decide(e, au, t, m)
+                        self._table[(exploitation, automatable, tech_impact, mission_impact)] = SSVC_ACTIONS[code]
+                        self._action_table[e, au, t, m] = code
 
-        if exploit_maturity in active_states: return ExploitationLevel.ACTIVE
-        elif exploit_maturity in poc_states: return ExploitationLevel.POC
+    # Inputs are expected to be strings: callers validate them once for a whole batch (see main.validate_cvss_columns)
+    # instead of type-checking every call.
+    def get_exploitation_level(self, exploit_maturity: str) -> ExploitationLevel:
+        exploit_maturity = exploit_maturity.lower()
+        if exploit_maturity in self._ACTIVE_STATES: return ExploitationLevel.ACTIVE
+        elif exploit_maturity in self._POC_STATES: return ExploitationLevel.POC
         else: return ExploitationLevel.NONE
 
     def is_automatable(self, attack_complexity: str, privileges_required: str, user_interaction: str) -> Automatable:
-        # Fail Fast: Ensure all inputs are strings
-        for arg_name, arg_val in locals().items():
-            if arg_name != 'self' and not isinstance(arg_val, str):
-                raise TypeError(f"{arg_name} must be a string.")
-
         is_auto = (attack_complexity.lower() == "l" and
                    privileges_required.lower() == "n" and
                    user_interaction.lower() == "n")
         return Automatable.YES if is_auto else Automatable.NO
 
     def get_technical_impact(self, confidentiality: str, integrity: str, availability: str) -> TechnicalImpact:
-        # Fail Fast: Ensure all inputs are strings
-        for arg_name, arg_val in locals().items():
-            if arg_name != 'self' and not isinstance(arg_val, str):
-                raise TypeError(f"{arg_name} must be a string.")
-
         # Fail Fast: Ensure values are valid CVSS metrics ('h', 'l', or 'n')
         valid_values = {'h', 'l', 'n'}
-        for arg_name, arg_val in [('c', confidentiality), ('i', integrity), ('a', availability)]:
-            if arg_val.lower() not in valid_values:
+        metrics = [('c', confidentiality, confidentiality.lower()), ('i', integrity, integrity.lower()), ('a', availability, availability.lower())]
+        for arg_name, arg_val, lowered in metrics:
+            if lowered not in valid_values:
                 raise ValueError(f"Invalid value for metric '{arg_name}': '{arg_val}'. Must be 'h', 'l', or 'n'.")
 
-        is_total = (confidentiality.lower() == "h" and
-                    integrity.lower() == "h" and
-                    availability.lower() == "h")
+        is_total = all(lowered == "h" for _, _, lowered in metrics)
         return TechnicalImpact.TOTAL if is_total else TechnicalImpact.PARTIAL
 
     def get_final_action(self, exploitation: ExploitationLevel, automatable: Automatable, tech_impact: TechnicalImpact, mission_impact: MissionImpact) -> SsvcAction:
-        # This function already receives Enums, so it's inherently robust. No changes needed.
-        if exploitation == ExploitationLevel.ACTIVE:
-            if automatable == Automatable.YES: return SsvcAction.ACT
-            else:
-                if tech_impact == TechnicalImpact.PARTIAL: return SsvcAction.ATTEND
-                else: return SsvcAction.ACT if mission_impact in [MissionImpact.HIGH, MissionImpact.MEDIUM] else SsvcAction.ATTEND
-        elif exploitation == ExploitationLevel.POC:
-            if automatable == Automatable.YES:
-                if tech_impact == TechnicalImpact.PARTIAL: return SsvcAction.TRACK_STAR
-                else: return SsvcAction.ATTEND if mission_impact in [MissionImpact.HIGH, MissionImpact.MEDIUM] else SsvcAction.TRACK_STAR
-            else:
-                if tech_impact == TechnicalImpact.PARTIAL: return SsvcAction.TRACK_STAR
-                else: return SsvcAction.ATTEND if mission_impact == MissionImpact.HIGH else SsvcAction.TRACK_STAR
-        else:
-            if automatable == Automatable.YES:
-                if tech_impact == TechnicalImpact.PARTIAL: return SsvcAction.TRACK
-                else: return SsvcAction.ATTEND if mission_impact == MissionImpact.HIGH else SsvcAction.TRACK
-            else:
-                if tech_impact == TechnicalImpact.PARTIAL: return SsvcAction.TRACK
-                else: return SsvcAction.TRACK_STAR if mission_impact == MissionImpact.HIGH else SsvcAction.TRACK
+        # A single hash lookup in the table precomputed from _decide
+        return self._table[(exploitation, automatable, tech_impact, mission_impact)]
+
+    def decide_codes(self, exploitation, automatable, tech_impact, mission_impact):
+        # Integer counterpart of get_final_action: takes Enum indices (scalars or 1-D arrays) and returns SsvcAction indices.
+        # Scalars run through the plain Python tree; arrays through the Numba kernel, or the precomputed table without Numba
+        codes = [np.asarray(values) for values in (exploitation, automatable, tech_impact, mission_impact)]
+        # Fail Fast: _decide treats any unknown code as its last branch, so out-of-range codes are rejected up front
+        if len({values.shape for values in codes}) > 1 or codes[0].ndim > 1:
+            raise ValueError("Decision codes must be scalars or 1-D arrays of the same length.")
+        for (name, size), values in zip(DECISION_POINTS, codes):
+            if values.size and (values.dtype.kind not in 'iu' or values.min() < 0 or values.max() >= size):
+                raise ValueError(f"Invalid {name} code: expected integers from 0 to {size - 1}.")
+
+        if codes[0].ndim == 0:
+            return _decide(*(int(values) for values in codes))
+        codes = [values.astype(np.int8) for values in codes]
+        decide_array = _compiled_decide_array()
+        if decide_array is None:  # Without Numba, the precomputed table gives the same codes
+            return self._action_table[tuple(codes)].astype(np.int8)
+        return decide_array(*codes)
+
+    def get_final_actions(self, exploitation_codes: np.ndarray, automatable_codes: np.ndarray, tech_impact_codes: np.ndarray, mission_impact_codes: np.ndarray) -> np.ndarray:
+        # Vectorized counterpart of get_final_action: takes arrays of Enum indices and returns the action names
+        codes = self._action_table[exploitation_codes, automatable_codes, tech_impact_codes, mission_impact_codes]
+        return self._action_names[codes]
 
     def get_ssvc_decision_path(self, ac: str, pr: str, ui: str, c: str, i: str, a: str, exploit_maturity: str, system_context: str) -> dict:
         exploitation = self.get_exploitation_level(exploit_maturity)
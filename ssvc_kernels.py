@@ -0,0 +1,15 @@
+# ssvc_kernels.py
+# Numba-compiled SSVC decision tree. Only imported by SsvcConverter.decide_codes, on first use:
+# compiled code is cached on disk, so later runs skip the compilation.
+import numpy as np
+from numba import njit, prange
+from ssvc_converter import _decide
+
+decide = njit(cache=True)(_decide)
+
+@njit(parallel=True, cache=True)
+def decide_array(exploitation, automatable, tech_impact, mission_impact):
+    actions = np.empty(exploitation.shape[0], dtype=np.int8)
+    for row in prange(exploitation.shape[0]):
+        actions[row] = decide(exploitation[row], automatable[row], tech_impact[row], mission_impact[row])
+    return actions